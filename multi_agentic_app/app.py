@@ -1,43 +1,59 @@
 import os
 import json
-import httpx
+import time
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, Query
-from fastapi.responses import PlainTextResponse
-from openai import AzureOpenAI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 
+from .startup import PROCESS_START, startup_state, validate_env, warm_up
 from .functions.agents_functions import rag_search, get_pricing_info
+from .functions.clients import close_clients, graph_client, openai_client
+from .functions.model_cascade import cascade_completion, cascade_stats, tool_call_error
+from .faq.table import FAQ_TABLE_PATH, FaqAnswerTable
 
 
 # -----------------------
-# ENV + OpenAI client
+# ENV
 # -----------------------
 load_dotenv()
 
 
-OPEN_AI_ENDPOINT = os.getenv("OPEN_AI_ENDPOINT")
-OPEN_AI_KEY = os.getenv("OPEN_AI_KEY")
-CHAT_MODEL = os.getenv("CHAT_MODEL")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL")
 
 
 VERIFY_TOKEN = os.getenv("VERIFY_TOKEN")
-WHATSAPP_TOKEN = os.getenv("WHATSAPP_TOKEN")
 PHONE_NUMBER_ID = os.getenv("PHONE_NUMBER_ID")
 
 
-if not OPEN_AI_ENDPOINT or not OPEN_AI_KEY or not CHAT_MODEL:
-    raise RuntimeError("Missing OPEN_AI_ENDPOINT / OPEN_AI_KEY / CHAT_MODEL")
-
-
-client = AzureOpenAI(
-    azure_endpoint=OPEN_AI_ENDPOINT,
-    api_key=OPEN_AI_KEY,
-    api_version="2024-12-01-preview",
-)
-
-
-app = FastAPI()
+# -----------------------
+# Lifespan: shared clients + warmup
+# -----------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the pooled clients before serving; warm them in the background so
+    # /healthz answers immediately and /readyz flips once warmup is done.
+    start = time.perf_counter()
+    validate_env()
+    openai_client()
+    graph_client()
+    startup_state["clients_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    print(f"STARTUP: clients built in {startup_state['clients_ms']} ms, "
+          f"{round((time.perf_counter() - PROCESS_START) * 1000, 1)} ms since import")
+
+    warmup_task = asyncio.create_task(warm_up())
+    yield
+    # Let a cancelled warmup retry unwind before its clients are closed under it.
+    warmup_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await warmup_task
+    await close_clients()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 # -----------------------
@@ -92,48 +108,39 @@ SYSTEM_PROMPT = (
 
 
 # -----------------------
-# Meta webhook verify
-# -----------------------
-@app.get("/webhook")
-async def verify_webhook(
-    hub_mode: str = Query(None, alias="hub.mode"),
-    hub_challenge: str = Query(None, alias="hub.challenge"),
-    hub_verify_token: str = Query(None, alias="hub.verify_token"),
-):
-    if hub_mode == "subscribe" and hub_verify_token == VERIFY_TOKEN:
-        return PlainTextResponse(content=hub_challenge, status_code=200)
-    return PlainTextResponse(content="Forbidden", status_code=403)
-
-
-# -----------------------
-# WhatsApp webhook
+# FAQ fast path
 # -----------------------
-@app.post("/webhook")
-async def webhook(request: Request):
-    body = await request.json()
+def _embed_query(text: str):
+    return openai_client().embeddings.create(model=EMBEDDING_MODEL, input=[text]).data[0].embedding
 
 
-    # Ignore status messages (delivered, read, etc.)
-    if body.get("entry", [{}])[0].get("changes", [{}])[0].get("value", {}).get("statuses"):
-        return {"status": "ignored_status"}
-
-
-    try:
-        msg_text = body["entry"][0]["changes"][0]["value"]["messages"][0]["text"]["body"]
-        sender_id = body["entry"][0]["changes"][0]["value"]["messages"][0]["from"]
-    except Exception:
-        return {"status": "ignored"}
+try:
+    faq_table = FaqAnswerTable.load(
+        os.getenv("FAQ_TABLE_PATH", FAQ_TABLE_PATH),
+        min_confidence=float(os.getenv("FAQ_MIN_CONFIDENCE", "0.7")),
+        vector_floor=float(os.getenv("FAQ_VECTOR_FLOOR", "0.3")),
+        embed=_embed_query if os.getenv("FAQ_VECTOR_MATCH") == "1" and EMBEDDING_MODEL else None,
+    )
+except (OSError, ValueError) as ex:
+    print("FAQ fast path disabled:", ex)
+    faq_table = None
 
 
+# -----------------------
+# Model + tools loop
+# -----------------------
+def generate_reply(msg_text: str) -> str:
     history = [
         {"role": "system", "content": SYSTEM_PROMPT},
         {"role": "user", "content": msg_text},
     ]
 
 
-    # 1) model call with tools enabled
-    resp1 = client.chat.completions.create(
-        model=CHAT_MODEL,
+    # 1) model call with tools enabled (escalates if the tool calls cannot be executed)
+    resp1 = cascade_completion(
+        openai_client(),
+        "router",
+        check=lambda r: tool_call_error(r, TOOL_IMPL),
         messages=history,
         tools=TOOLS,
         tool_choice="auto",
@@ -152,12 +159,17 @@ async def webhook(request: Request):
 
         for call in tool_calls:
             fn_name = call.function.name
-            args = json.loads(call.function.arguments or "{}")
+            try:
+                args = json.loads(call.function.arguments or "{}")
+            except ValueError:
+                args = None
 
 
             fn = TOOL_IMPL.get(fn_name)
             if not fn:
                 tool_result = f"[tool_error] Unknown tool: {fn_name}"
+            elif args is None:
+                tool_result = f"[tool_error] {fn_name} got invalid arguments"
             else:
                 try:
                     tool_result = fn(**args)
@@ -174,21 +186,65 @@ async def webhook(request: Request):
             )
 
 
-        resp2 = client.chat.completions.create(
-            model=CHAT_MODEL,
-            messages=history,
-        )
+        resp2 = cascade_completion(openai_client(), "answer", messages=history)
         reply_text = resp2.choices[0].message.content or "No response."
 
 
-    # 3) send to WhatsApp
-    url = f"https://graph.facebook.com/v22.0/{PHONE_NUMBER_ID}/messages"
-    headers = {
-        "Authorization": f"Bearer {WHATSAPP_TOKEN}",
-        "Content-Type": "application/json",
-    }
+    return reply_text
+
+
+# -----------------------
+# Meta webhook verify
+# -----------------------
+@app.get("/webhook")
+async def verify_webhook(
+    hub_mode: str = Query(None, alias="hub.mode"),
+    hub_challenge: str = Query(None, alias="hub.challenge"),
+    hub_verify_token: str = Query(None, alias="hub.verify_token"),
+):
+    if hub_mode == "subscribe" and hub_verify_token == VERIFY_TOKEN:
+        return PlainTextResponse(content=hub_challenge, status_code=200)
+    return PlainTextResponse(content="Forbidden", status_code=403)
+
+
+# -----------------------
+# WhatsApp webhook
+# -----------------------
+@app.post("/webhook")
+async def webhook(request: Request):
+    body = await request.json()
+
+
+    # Ignore status messages (delivered, read, etc.)
+    if body.get("entry", [{}])[0].get("changes", [{}])[0].get("value", {}).get("statuses"):
+        return {"status": "ignored_status"}
+
+
+    try:
+        msg_text = body["entry"][0]["changes"][0]["value"]["messages"][0]["text"]["body"]
+        sender_id = body["entry"][0]["changes"][0]["value"]["messages"][0]["from"]
+    except Exception:
+        return {"status": "ignored"}
+
+
+    # 0) FAQ fast path: answer known questions without calling the model
+    # (the vector match and generate_reply make blocking OpenAI calls, so keep them
+    # off the event loop that also serves /healthz, /readyz and the warmup task)
+    faq_hit = None
+    if faq_table:
+        faq_hit = (
+            await run_in_threadpool(faq_table.lookup, msg_text)
+            if faq_table.uses_vectors
+            else faq_table.lookup(msg_text)
+        )
+    if faq_hit:
+        reply_text = faq_hit["answer"]
+        print("FAQ HIT:", faq_hit["id"], f"{faq_hit['confidence']:.2f}", faq_hit["method"])
+    else:
+        reply_text = await run_in_threadpool(generate_reply, msg_text)
 
 
+    # 3) send to WhatsApp
     payload = {
         "messaging_product": "whatsapp",
         "to": sender_id,
@@ -197,11 +253,36 @@ async def webhook(request: Request):
     }
 
 
-    async with httpx.AsyncClient() as http_client:
-        resp = await http_client.post(url, headers=headers, json=payload)
-        print("WA SEND:", resp.status_code, resp.text)
+    # Shared pooled client: reuses the connection opened during warmup
+    resp = await graph_client().post(f"/{PHONE_NUMBER_ID}/messages", json=payload)
+    print("WA SEND:", resp.status_code, resp.text)
 
 
     return {"status": "ok", "bot_reply": reply_text}
 
 
+# -----------------------
+# Health + readiness
+# -----------------------
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    status_code = 200 if startup_state["ready"] else 503
+    status = "ready" if startup_state["ready"] else ("retrying" if startup_state["warmup_done"] else "warming_up")
+    return JSONResponse(status_code=status_code, content={"status": status, **startup_state})
+
+
+# -----------------------
+# Metrics
+# -----------------------
+@app.get("/metrics")
+async def metrics():
+    return {
+        "startup": startup_state,
+        "faq": faq_table.export_stats() if faq_table else None,
+        "cascade": cascade_stats.export(),
+    }
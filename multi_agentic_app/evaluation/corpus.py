@@ -0,0 +1,72 @@
+import io
+import os
+import zipfile
+from dataclasses import dataclass
+from typing import Dict, List
+
+from pypdf import PdfReader
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "data")
+
+
+@dataclass
+class Chunk:
+    chunk_id: str
+    source: str
+    text: str
+
+
+# -----------------------
+# Corpus loading
+# -----------------------
+def _pdf_text(data: bytes) -> str:
+    reader = PdfReader(io.BytesIO(data))
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def load_documents(data_dir: str = DATA_DIR) -> List[Dict[str, str]]:
+    """
+    Loads every PDF in data_dir, including PDFs inside .zip archives.
+    - Sources are named "<file>.pdf" or "<archive>.zip/<member>.pdf".
+    """
+    documents: List[Dict[str, str]] = []
+    for name in sorted(os.listdir(data_dir)):
+        path = os.path.join(data_dir, name)
+        if name.lower().endswith(".pdf"):
+            with open(path, "rb") as f:
+                documents.append({"source": name, "text": _pdf_text(f.read())})
+        elif name.lower().endswith(".zip"):
+            with zipfile.ZipFile(path) as archive:
+                for member in sorted(archive.namelist()):
+                    if member.lower().endswith(".pdf") and not member.startswith("__MACOSX"):
+                        documents.append(
+                            {"source": f"{name}/{member}", "text": _pdf_text(archive.read(member))}
+                        )
+    return documents
+
+
+def chunk_documents(
+    documents: List[Dict[str, str]],
+    chunk_size: int,
+    chunk_overlap: int,
+) -> List[Chunk]:
+    """
+    Splits each document into windows of chunk_size words overlapping by chunk_overlap words.
+    """
+    if chunk_size <= 0 or not 0 <= chunk_overlap < chunk_size:
+        raise ValueError("chunk_size must be > 0 and 0 <= chunk_overlap < chunk_size")
+
+    step = chunk_size - chunk_overlap
+    chunks: List[Chunk] = []
+    for doc in documents:
+        words = doc["text"].split()
+        for n, start in enumerate(range(0, max(len(words) - chunk_overlap, 1), step)):
+            chunks.append(
+                Chunk(
+                    chunk_id=f"{doc['source']}#{n}",
+                    source=doc["source"],
+                    text=" ".join(words[start:start + chunk_size]),
+                )
+            )
+    return chunks
@@ -0,0 +1,83 @@
+import os
+import re
+from typing import Dict, List, Tuple
+
+from openai import AzureOpenAI
+
+from .corpus import Chunk
+from ..functions.agents_functions import NO_INFO_FOUND, RAG_SYSTEM_PROMPT
+from ..functions.text_utils import content_tokens, tokenize
+
+
+def approx_tokens(text: str) -> int:
+    """
+    Rough token count (words + punctuation) for when the API reports no usage.
+    """
+    return len(re.findall(r"\w+|[^\w\s]", text))
+
+
+def _context_block(chunks: List[Chunk]) -> str:
+    return "\n\n".join(f"[doc{n}] ({c.source})\n{c.text}" for n, c in enumerate(chunks, start=1))
+
+
+class ExtractiveGenerator:
+    """
+    Offline stand-in for the grounded generation step.
+    - Answers with the retrieved sentences that best overlap the question.
+    - Returns NO_INFO_FOUND when too few question terms appear in the context.
+    """
+
+    name = "extractive"
+
+    def __init__(self, min_overlap: float = 0.5, max_sentences: int = 2):
+        self.min_overlap = min_overlap
+        self.max_sentences = max_sentences
+
+    def generate(self, question: str, chunks: List[Chunk]) -> Tuple[str, int]:
+        terms = set(content_tokens(question))
+        context_terms = set(tokenize(" ".join(c.text for c in chunks)))
+        if not terms or len(terms & context_terms) / len(terms) < self.min_overlap:
+            return NO_INFO_FOUND, approx_tokens(NO_INFO_FOUND)
+
+        sentences = [
+            s.strip()
+            for c in chunks
+            for s in re.split(r"(?<=[.!?])\s+", c.text)
+            if s.strip()
+        ]
+        ranked = sorted(sentences, key=lambda s: len(terms & set(tokenize(s))), reverse=True)
+        answer = " ".join(ranked[:self.max_sentences])
+        return answer, approx_tokens(answer)
+
+
+class AzureChatGenerator:
+    """
+    Grounded generation with CHAT_MODEL over the locally retrieved chunks,
+    using the same system prompt as rag_search.
+    """
+
+    name = "azure"
+
+    def __init__(self):
+        self.model = os.getenv("CHAT_MODEL")
+        if not self.model:
+            raise RuntimeError("Missing CHAT_MODEL")
+        self.client = AzureOpenAI(
+            api_version="2024-12-01-preview",
+            azure_endpoint=os.getenv("OPEN_AI_ENDPOINT"),
+            api_key=os.getenv("OPEN_AI_KEY"),
+        )
+
+    def generate(self, question: str, chunks: List[Chunk]) -> Tuple[str, int]:
+        messages: List[Dict[str, str]] = [
+            {"role": "system", "content": RAG_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": f"Documents:\n{_context_block(chunks)}\n\nQuestion: {question}",
+            },
+        ]
+        response = self.client.chat.completions.create(model=self.model, messages=messages)
+        answer = response.choices[0].message.content or ""
+        usage = getattr(response, "usage", None)
+        tokens = usage.completion_tokens if usage else approx_tokens(answer)
+        return answer, tokens
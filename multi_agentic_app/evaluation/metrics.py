@@ -0,0 +1,101 @@
+from typing import Dict, List, Optional
+
+from .corpus import Chunk
+from ..functions.text_utils import content_tokens, normalize_text
+from ..functions.agents_functions import NO_INFO_FOUND
+
+
+def is_relevant(chunk: Chunk, item: Dict) -> bool:
+    """
+    A chunk is relevant when it comes from the item's source and contains its evidence span.
+    """
+    return chunk.source == item["source"] and normalize_text(item["evidence"]) in normalize_text(chunk.text)
+
+
+def first_relevant_rank(chunks: List[Chunk], item: Dict) -> Optional[int]:
+    for rank, chunk in enumerate(chunks, start=1):
+        if is_relevant(chunk, item):
+            return rank
+    return None
+
+
+def is_no_info(answer: str) -> bool:
+    return NO_INFO_FOUND in answer
+
+
+def keyword_coverage(answer: str, keywords: List[str]) -> float:
+    """
+    Fraction of the golden answer keywords present in the answer.
+    """
+    if not keywords:
+        return 1.0
+    text = normalize_text(answer)
+    return sum(normalize_text(k) in text for k in keywords) / len(keywords)
+
+
+def groundedness(answer: str, context: str) -> float:
+    """
+    Proxy for groundedness: fraction of the answer's content tokens that appear in the context.
+    """
+    answer_tokens = content_tokens(answer)
+    if not answer_tokens:
+        return 1.0
+    context_tokens = set(content_tokens(context))
+    return sum(t in context_tokens for t in answer_tokens) / len(answer_tokens)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def _mean(values: List[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def summarize(records: List[Dict]) -> Dict[str, float]:
+    """
+    Aggregates per-question records into one report row.
+    - Retrieval metrics (recall@k, MRR) only cover answerable questions with a known rank.
+    - no_info_rate is measured on answerable questions (lower is better),
+      abstention_rate on unanswerable ones (higher is better).
+    - FAQ fast-path records (with "faq_hit") answer only on a hit, so they report
+      false_hit_rate on unanswerable questions instead of no_info_rate / abstention_rate.
+    - A metric whose filtered record list is empty is left out rather than reported as 0.
+    """
+    answerable = [r for r in records if r["answerable"]]
+    unanswerable = [r for r in records if not r["answerable"]]
+    ranked = [r for r in answerable if "rank" in r]
+    answered = [r for r in records if r.get("answer") is not None]
+    is_faq = any("faq_hit" in r for r in records)
+
+    candidates: Dict[str, List[float]] = {
+        "recall_at_k": [1.0 if r["rank"] else 0.0 for r in ranked],
+        "mrr": [1.0 / r["rank"] if r["rank"] else 0.0 for r in ranked],
+        "keyword_coverage": [r["keyword_coverage"] for r in answered if r["answerable"]],
+        "groundedness": [r["groundedness"] for r in answered if not is_no_info(r["answer"])],
+        "tokens_per_answer": [r["tokens"] for r in answered],
+    }
+    if is_faq:
+        candidates["faq_hit_rate"] = [1.0 if r.get("faq_hit") else 0.0 for r in records]
+        candidates["false_hit_rate"] = [1.0 if r.get("faq_hit") else 0.0 for r in unanswerable]
+    else:
+        candidates["no_info_rate"] = [
+            1.0 if is_no_info(r["answer"]) else 0.0 for r in answered if r["answerable"]
+        ]
+        candidates["abstention_rate"] = [
+            1.0 if is_no_info(r["answer"]) else 0.0 for r in answered if not r["answerable"]
+        ]
+
+    summary: Dict[str, float] = {"questions": len(records)}
+    summary.update({name: _mean(values) for name, values in candidates.items() if values})
+
+    stages = sorted({s for r in records for s in r["latency_ms"]})
+    for stage in stages:
+        values = [r["latency_ms"][stage] for r in records if stage in r["latency_ms"]]
+        summary[f"{stage}_p50_ms"] = percentile(values, 50)
+        summary[f"{stage}_p95_ms"] = percentile(values, 95)
+    return summary
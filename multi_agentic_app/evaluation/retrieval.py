@@ -0,0 +1,154 @@
+import math
+import os
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from openai import AzureOpenAI
+
+from .corpus import Chunk
+from ..functions.text_utils import content_tokens, stem
+
+
+QUERY_TYPES = ("vector", "simple", "vector_simple_hybrid")
+
+
+# -----------------------
+# Embeddings
+# -----------------------
+class HashingEmbedder:
+    """
+    Offline stand-in for the embedding deployment.
+    - Hashes word unigrams/bigrams and character trigrams into a fixed-size, L2-normalized vector.
+    - Deterministic across runs, needs no network or credentials.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[Tuple[str, float]]:
+        words = [stem(w) for w in content_tokens(text)]
+        features = [(w, 1.0) for w in words]
+        features += [(f"{a} {b}", 1.0) for a, b in zip(words, words[1:])]
+        for w in words:
+            padded = f"#{w}#"
+            features += [(padded[i:i + 3], 0.3) for i in range(len(padded) - 2)]
+        return features
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        vectors = []
+        for text in texts:
+            vec = [0.0] * self.dim
+            for feature, weight in self._features(text):
+                h = zlib.crc32(feature.encode("utf-8"))
+                vec[h % self.dim] += weight if (h >> 16) & 1 else -weight
+            norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+            vectors.append([v / norm for v in vec])
+        return vectors
+
+
+class AzureEmbedder:
+    """
+    Uses the EMBEDDING_MODEL deployment, i.e. the same embeddings the search index is built with.
+    """
+
+    name = "azure"
+
+    def __init__(self, batch_size: int = 16):
+        self.model = os.getenv("EMBEDDING_MODEL")
+        if not self.model:
+            raise RuntimeError("Missing EMBEDDING_MODEL")
+        self.client = AzureOpenAI(
+            api_version="2024-12-01-preview",
+            azure_endpoint=os.getenv("OPEN_AI_ENDPOINT"),
+            api_key=os.getenv("OPEN_AI_KEY"),
+        )
+        self.batch_size = batch_size
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[List[float]] = []
+        for i in range(0, len(texts), self.batch_size):
+            response = self.client.embeddings.create(
+                model=self.model, input=texts[i:i + self.batch_size]
+            )
+            vectors += [item.embedding for item in response.data]
+        return vectors
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+# -----------------------
+# Index
+# -----------------------
+class LocalIndex:
+    """
+    In-memory replica of the search index used to compare retrieval settings offline.
+    - query_type mirrors the azure_search data source: "vector", "simple" (BM25 keyword)
+      and "vector_simple_hybrid" (reciprocal rank fusion of both).
+    """
+
+    def __init__(self, chunks: List[Chunk], embedder, k1: float = 1.2, b: float = 0.75):
+        self.chunks = chunks
+        self.vectors = embedder.embed([c.text for c in chunks]) if chunks else []
+
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(content_tokens(c.text)) for c in chunks]
+        self.doc_lens = [sum(tf.values()) for tf in self.term_freqs]
+        self.avg_len = (sum(self.doc_lens) / len(self.doc_lens)) if self.doc_lens else 0.0
+        doc_freq: Counter = Counter()
+        for tf in self.term_freqs:
+            doc_freq.update(tf.keys())
+        n = len(chunks)
+        self.idf = {t: math.log(1 + (n - df + 0.5) / (df + 0.5)) for t, df in doc_freq.items()}
+
+    def _vector_ranking(self, query_vector: List[float]) -> List[Tuple[int, float]]:
+        scores = [(i, _cosine(query_vector, v)) for i, v in enumerate(self.vectors)]
+        return sorted(scores, key=lambda s: s[1], reverse=True)
+
+    def _bm25_ranking(self, query: str) -> List[Tuple[int, float]]:
+        terms = [t for t in content_tokens(query) if t in self.idf]
+        scores = []
+        for i, tf in enumerate(self.term_freqs):
+            score = 0.0
+            for t in terms:
+                f = tf.get(t, 0)
+                if f:
+                    denom = f + self.k1 * (1 - self.b + self.b * self.doc_lens[i] / self.avg_len)
+                    score += self.idf[t] * f * (self.k1 + 1) / denom
+            scores.append((i, score))
+        return sorted(scores, key=lambda s: s[1], reverse=True)
+
+    def search(
+        self,
+        query: str,
+        query_type: str,
+        top_k: int,
+        query_vector: Optional[List[float]] = None,
+        rrf_k: int = 60,
+    ) -> List[Tuple[Chunk, float]]:
+        """
+        Returns the top_k (chunk, score) pairs.
+        - query_vector must be given for "vector" and "vector_simple_hybrid".
+        """
+        if query_type not in QUERY_TYPES:
+            raise ValueError(f"Unknown query_type: {query_type}")
+
+        if query_type == "vector":
+            ranking = self._vector_ranking(query_vector)
+        elif query_type == "simple":
+            ranking = self._bm25_ranking(query)
+        else:
+            fused: Dict[int, float] = {}
+            for ranked in (self._vector_ranking(query_vector), self._bm25_ranking(query)):
+                for rank, (i, _) in enumerate(ranked):
+                    fused[i] = fused.get(i, 0.0) + 1.0 / (rrf_k + rank + 1)
+            ranking = sorted(fused.items(), key=lambda s: s[1], reverse=True)
+
+        return [(self.chunks[i], score) for i, score in ranking[:top_k]]
@@ -0,0 +1,262 @@
+"""
+Offline retrieval-quality and latency evaluation over the bundled data/ corpus.
+
+    python -m multi_agentic_app.evaluation.run_eval
+    python -m multi_agentic_app.evaluation.run_eval --query-type vector simple --top-k 3 5 --chunk-size 60 120
+    python -m multi_agentic_app.evaluation.run_eval --embeddings azure --generator azure
+    python -m multi_agentic_app.evaluation.run_eval --rag-search
+    python -m multi_agentic_app.evaluation.run_eval --faq
+
+Defaults (hashing embeddings + extractive generator) need no credentials or network.
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+from typing import Dict, List
+
+from dotenv import load_dotenv
+
+from .corpus import DATA_DIR, chunk_documents, load_documents
+from .generation import AzureChatGenerator, ExtractiveGenerator, approx_tokens
+from .metrics import first_relevant_rank, groundedness, keyword_coverage, summarize
+from .retrieval import QUERY_TYPES, AzureEmbedder, HashingEmbedder, LocalIndex
+from ..faq.table import FAQ_TABLE_PATH, FaqAnswerTable
+from ..functions.model_cascade import cascade_stats
+
+
+GOLDEN_SET = os.path.join(os.path.dirname(__file__), "golden_set.json")
+
+REPORT_COLUMNS = [
+    "faq_hit_rate",
+    "recall_at_k",
+    "mrr",
+    "keyword_coverage",
+    "groundedness",
+    "no_info_rate",
+    "abstention_rate",
+    "false_hit_rate",
+    "tokens_per_answer",
+    "embed_p50_ms",
+    "retrieve_p50_ms",
+    "generate_p50_ms",
+    "total_p50_ms",
+    "total_p95_ms",
+]
+
+
+def _ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+def load_golden_set(path: str = GOLDEN_SET) -> List[Dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# -----------------------
+# Runs
+# -----------------------
+def evaluate_config(
+    golden: List[Dict],
+    index: LocalIndex,
+    embedder,
+    generator,
+    query_type: str,
+    top_k: int,
+) -> List[Dict]:
+    """
+    Runs every golden question through embed -> retrieve -> generate and records per-stage latency.
+    """
+    records = []
+    for item in golden:
+        latency: Dict[str, float] = {}
+        query_vector = None
+        total_start = time.perf_counter()
+
+        if query_type != "simple":
+            start = time.perf_counter()
+            query_vector = embedder.embed([item["question"]])[0]
+            latency["embed"] = _ms(start)
+
+        start = time.perf_counter()
+        hits = index.search(item["question"], query_type, top_k, query_vector=query_vector)
+        latency["retrieve"] = _ms(start)
+        chunks = [chunk for chunk, _ in hits]
+
+        record: Dict = {"id": item["id"], "answerable": item["answerable"], "latency_ms": latency}
+        if item["answerable"]:
+            record["rank"] = first_relevant_rank(chunks, item)
+
+        if generator is not None:
+            start = time.perf_counter()
+            answer, tokens = generator.generate(item["question"], chunks)
+            latency["generate"] = _ms(start)
+            record.update(
+                answer=answer,
+                tokens=tokens,
+                keyword_coverage=keyword_coverage(answer, item.get("answer_keywords", [])),
+                groundedness=groundedness(answer, " ".join(c.text for c in chunks)),
+            )
+
+        latency["total"] = _ms(total_start)
+        records.append(record)
+    return records
+
+
+def evaluate_rag_search(golden: List[Dict], documents: List[Dict]) -> List[Dict]:
+    """
+    End-to-end run against the deployed rag_search tool (Azure OpenAI + Azure AI Search).
+    - Retrieval ranks are not exposed by rag_search, so only answer metrics and latency are reported.
+    - Groundedness is measured against the whole corpus instead of the retrieved context.
+    - The row also carries the model cascade's per-tier usage and escalation rate for the run.
+    """
+    from ..functions.agents_functions import rag_search
+
+    corpus = " ".join(d["text"] for d in documents)
+    records = []
+    for item in golden:
+        start = time.perf_counter()
+        answer = rag_search(item["question"])
+        records.append(
+            {
+                "id": item["id"],
+                "answerable": item["answerable"],
+                "latency_ms": {"total": _ms(start)},
+                "answer": answer,
+                "tokens": approx_tokens(answer),
+                "keyword_coverage": keyword_coverage(answer, item.get("answer_keywords", [])),
+                "groundedness": groundedness(answer, corpus),
+            }
+        )
+    return records
+
+
+def evaluate_faq_table(golden: List[Dict], documents: List[Dict], path: str = FAQ_TABLE_PATH) -> List[Dict]:
+    """
+    Runs the golden questions through the precomputed FAQ fast path.
+    - Misses carry no answer (they would fall through to the LLM), so answer metrics cover hits only.
+    - A hit on an unanswerable question counts towards false_hit_rate.
+    """
+    table = FaqAnswerTable.load(path)
+    corpus = " ".join(d["text"] for d in documents)
+    records = []
+    for item in golden:
+        start = time.perf_counter()
+        hit = table.lookup(item["question"])
+        record: Dict = {
+            "id": item["id"],
+            "answerable": item["answerable"],
+            "latency_ms": {"total": _ms(start)},
+            "faq_hit": hit is not None,
+        }
+        if hit:
+            record.update(
+                answer=hit["answer"],
+                confidence=hit["confidence"],
+                tokens=approx_tokens(hit["answer"]),
+                keyword_coverage=keyword_coverage(hit["answer"], item.get("answer_keywords", [])),
+                groundedness=groundedness(hit["answer"], corpus),
+            )
+        records.append(record)
+    return records
+
+
+# -----------------------
+# Reporting
+# -----------------------
+def print_report(rows: List[Dict]) -> None:
+    headers = ["config"] + REPORT_COLUMNS
+    table = [
+        [row["config"]] + [
+            f"{row['summary'][c]:.3f}" if c in row["summary"] else "-" for c in REPORT_COLUMNS
+        ]
+        for row in rows
+    ]
+    widths = [max(len(str(x)) for x in col) for col in zip(headers, *table)]
+    for line in [headers] + table:
+        print("  ".join(str(x).ljust(w) for x, w in zip(line, widths)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--golden", default=GOLDEN_SET)
+    parser.add_argument("--query-type", nargs="+", choices=QUERY_TYPES, default=list(QUERY_TYPES))
+    parser.add_argument("--top-k", nargs="+", type=int, default=[3, 5])
+    parser.add_argument("--chunk-size", nargs="+", type=int, default=[80])
+    parser.add_argument("--chunk-overlap", type=int, default=20)
+    parser.add_argument("--embeddings", choices=["hashing", "azure"], default="hashing")
+    parser.add_argument("--generator", choices=["extractive", "azure", "none"], default="extractive")
+    parser.add_argument("--rag-search", action="store_true", help="Also evaluate the deployed rag_search tool end to end.")
+    parser.add_argument("--faq", action="store_true", help="Also evaluate the precomputed FAQ fast path.")
+    parser.add_argument("--output", help="Write per-question records and summaries as JSON.")
+    args = parser.parse_args()
+
+    load_dotenv()
+    golden = load_golden_set(args.golden)
+    documents = load_documents(args.data_dir)
+
+    embedder = AzureEmbedder() if args.embeddings == "azure" else HashingEmbedder()
+    generator = {
+        "extractive": ExtractiveGenerator,
+        "azure": AzureChatGenerator,
+        "none": lambda: None,
+    }[args.generator]()
+
+    rows = []
+    for chunk_size in args.chunk_size:
+        chunks = chunk_documents(documents, chunk_size, min(args.chunk_overlap, chunk_size - 1))
+        start = time.perf_counter()
+        index = LocalIndex(chunks, embedder)
+        index_ms = _ms(start)
+
+        for query_type, top_k in itertools.product(args.query_type, args.top_k):
+            records = evaluate_config(golden, index, embedder, generator, query_type, top_k)
+            summary = summarize(records)
+            summary["index_build_ms"] = index_ms
+            summary["chunks"] = len(chunks)
+            rows.append(
+                {
+                    "config": f"{query_type}/k={top_k}/chunk={chunk_size}",
+                    "settings": {
+                        "query_type": query_type,
+                        "top_k": top_k,
+                        "chunk_size": chunk_size,
+                        "chunk_overlap": args.chunk_overlap,
+                        "embeddings": embedder.name,
+                        "generator": getattr(generator, "name", "none"),
+                    },
+                    "summary": summary,
+                    "records": records,
+                }
+            )
+
+    if args.rag_search:
+        records = evaluate_rag_search(golden, documents)
+        rows.append(
+            {
+                "config": "rag_search",
+                "settings": {},
+                "summary": summarize(records),
+                "cascade": cascade_stats.export(),
+                "records": records,
+            }
+        )
+
+    if args.faq:
+        records = evaluate_faq_table(golden, documents)
+        rows.append(
+            {"config": "faq_table", "settings": {}, "summary": summarize(records), "records": records}
+        )
+
+    print_report(rows)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
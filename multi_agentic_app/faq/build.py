@@ -0,0 +1,164 @@
+"""
+Offline job: extracts the FAQ sections from the knowledge-base PDF and precomputes grounded answers.
+
+    python -m multi_agentic_app.faq.build
+    python -m multi_agentic_app.faq.build --answers azure --paraphrases 5 --embeddings azure
+
+By default the answer is the section text itself (grounded by construction, no credentials needed).
+--answers azure rewrites it into a short reply with CHAT_MODEL under the rag_search rules,
+--paraphrases asks CHAT_MODEL for extra question wordings to index,
+--embeddings azure stores question vectors for the optional vector match.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from dotenv import load_dotenv
+from openai import AzureOpenAI
+from pypdf import PdfReader
+
+from .table import FAQ_TABLE_PATH, FAQ_TABLE_VERSION
+from ..evaluation.corpus import DATA_DIR
+from ..functions.agents_functions import NO_INFO_FOUND, RAG_SYSTEM_PROMPT
+from ..functions.text_utils import normalize_text
+
+
+FAQ_SOURCE = "business_faq_extended_demo.pdf"
+
+
+def _is_heading(line: str) -> bool:
+    words = line.split()
+    return 0 < len(words) <= 4 and not line.rstrip().endswith((".", ",", ":")) and all(
+        w[0].isupper() or not w[0].isalpha() for w in words
+    )
+
+
+def extract_sections(pdf_path: str) -> List[Dict[str, str]]:
+    """
+    Splits the FAQ into {"title", "text"} sections; titles are short Title Case lines.
+    - The first line is the document title and is skipped.
+    """
+    reader = PdfReader(pdf_path)
+    lines = [
+        line.strip()
+        for page in reader.pages
+        for line in (page.extract_text() or "").splitlines()
+        if line.strip()
+    ][1:]
+
+    sections: List[Dict[str, str]] = []
+    for line in lines:
+        if _is_heading(line):
+            sections.append({"title": line, "text": ""})
+        elif sections:
+            sections[-1]["text"] = f"{sections[-1]['text']} {line}".strip()
+    return [s for s in sections if s["text"]]
+
+
+def _slug(title: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", normalize_text(title)).strip("-")
+
+
+# -----------------------
+# Optional Azure steps
+# -----------------------
+def _client() -> AzureOpenAI:
+    return AzureOpenAI(
+        api_version="2024-12-01-preview",
+        azure_endpoint=os.getenv("OPEN_AI_ENDPOINT"),
+        api_key=os.getenv("OPEN_AI_KEY"),
+    )
+
+
+def grounded_answer(client: AzureOpenAI, model: str, section: Dict[str, str]) -> str:
+    response = client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": RAG_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": (
+                    f"Document section '{section['title']}':\n{section['text']}\n\n"
+                    f"Question: What should a customer know about {section['title'].lower()}?"
+                ),
+            },
+        ],
+    )
+    answer = (response.choices[0].message.content or "").strip()
+    return section["text"] if not answer or NO_INFO_FOUND in answer else answer
+
+
+def paraphrase_questions(client: AzureOpenAI, model: str, section: Dict[str, str], n: int) -> List[str]:
+    response = client.chat.completions.create(
+        model=model,
+        messages=[
+            {
+                "role": "user",
+                "content": (
+                    f"Write {n} short, different customer questions that are fully answered by this text. "
+                    f"One per line, no numbering.\n\n{section['title']}: {section['text']}"
+                ),
+            },
+        ],
+    )
+    lines = (response.choices[0].message.content or "").splitlines()
+    return [line.strip(" -•\t") for line in lines if line.strip(" -•\t")][:n]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default=os.path.join(DATA_DIR, FAQ_SOURCE))
+    parser.add_argument("--output", default=FAQ_TABLE_PATH)
+    parser.add_argument("--answers", choices=["section", "azure"], default="section")
+    parser.add_argument("--paraphrases", type=int, default=0)
+    parser.add_argument("--embeddings", choices=["none", "azure"], default="none")
+    args = parser.parse_args()
+
+    load_dotenv()
+    chat_model = os.getenv("CHAT_MODEL")
+    embedding_model = os.getenv("EMBEDDING_MODEL")
+    needs_chat = args.answers == "azure" or args.paraphrases > 0
+    if needs_chat and not chat_model:
+        raise RuntimeError("Missing CHAT_MODEL")
+    if args.embeddings == "azure" and not embedding_model:
+        raise RuntimeError("Missing EMBEDDING_MODEL")
+    client = _client() if needs_chat or args.embeddings == "azure" else None
+
+    with open(args.source, "rb") as f:
+        source_sha256 = hashlib.sha256(f.read()).hexdigest()
+
+    entries = []
+    for section in extract_sections(args.source):
+        questions = [section["title"]]
+        if args.paraphrases > 0:
+            questions += paraphrase_questions(client, chat_model, section, args.paraphrases)
+        answer = grounded_answer(client, chat_model, section) if args.answers == "azure" else section["text"]
+
+        entry = {"id": _slug(section["title"]), "questions": questions, "answer": answer}
+        if args.embeddings == "azure":
+            response = client.embeddings.create(model=embedding_model, input=questions)
+            entry["vectors"] = [[round(x, 5) for x in item.embedding] for item in response.data]
+        entries.append(entry)
+
+    artifact = {
+        "version": FAQ_TABLE_VERSION,
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "source": os.path.basename(args.source),
+        "source_sha256": source_sha256,
+        "answers": f"azure:{chat_model}" if args.answers == "azure" else "section",
+        "embedding_model": embedding_model if args.embeddings == "azure" else None,
+        "entries": entries,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        # Vectors make an indented file huge; keep it compact in that case.
+        json.dump(artifact, f, ensure_ascii=False, indent=None if args.embeddings == "azure" else 2)
+        f.write("\n")
+    print(f"Wrote {len(entries)} FAQ entries to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
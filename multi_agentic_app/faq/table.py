@@ -0,0 +1,182 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..functions.text_utils import content_tokens, stem
+
+
+FAQ_TABLE_VERSION = 1
+FAQ_TABLE_PATH = os.path.join(os.path.dirname(__file__), "faq_answers.json")
+
+QUESTION_BOOST = 3
+
+
+def _terms(text: str) -> List[str]:
+    return [stem(t) for t in content_tokens(text)]
+
+
+class FaqAnswerTable:
+    """
+    Precomputed FAQ answers with a token inverted index (BM25 scoring) in front.
+    - lookup() returns an entry only for high-confidence matches; anything else falls through to the LLM.
+    - Confidence is the idf-weighted share of query terms the best entry covers,
+      scaled down when the runner-up scores close to it.
+    - If the artifact was built with question embeddings and an embed function is given,
+      a cosine match is tried when the keyword match is not confident but scores at least
+      vector_floor; below that an embeddings round trip is unlikely to find an FAQ answer.
+    """
+
+    def __init__(
+        self,
+        artifact: Dict,
+        min_confidence: float = 0.7,
+        min_similarity: float = 0.88,
+        vector_floor: float = 0.3,
+        embed: Optional[Callable[[str], List[float]]] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        if artifact.get("version") != FAQ_TABLE_VERSION:
+            raise ValueError(
+                f"FAQ table version {artifact.get('version')} != expected {FAQ_TABLE_VERSION}"
+            )
+        self.artifact = artifact
+        self.entries: List[Dict] = artifact["entries"]
+        self.min_confidence = min_confidence
+        self.min_similarity = min_similarity
+        self.vector_floor = vector_floor
+        self.embed = embed
+        self.k1 = k1
+        self.b = b
+
+        # term -> [(entry index, weighted term frequency)]
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.doc_lens: List[int] = []
+        for i, entry in enumerate(self.entries):
+            tf: Counter = Counter(_terms(entry["answer"]))
+            for question in entry["questions"]:
+                for term in _terms(question):
+                    tf[term] += QUESTION_BOOST
+            for term, freq in tf.items():
+                self.postings.setdefault(term, []).append((i, freq))
+            self.doc_lens.append(sum(tf.values()))
+
+        n = len(self.entries)
+        self.avg_len = (sum(self.doc_lens) / n) if n else 0.0
+        self.idf = {
+            term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5))
+            for term, p in self.postings.items()
+        }
+        self.max_idf = max(self.idf.values(), default=1.0)
+        self.uses_vectors = bool(embed) and any(e.get("vectors") for e in self.entries)
+
+        # lookup() runs in the threadpool when vectors are on, so updates take the lock.
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "lookups": 0,
+            "hits": 0,
+            "hits_by_method": {"keyword": 0, "vector": 0},
+            "confidence_histogram": [0] * 10,
+            "lookup_us_total": 0.0,
+        }
+
+    @classmethod
+    def load(cls, path: str = FAQ_TABLE_PATH, **kwargs) -> "FaqAnswerTable":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), **kwargs)
+
+    # -----------------------
+    # Matching
+    # -----------------------
+    def _keyword_match(self, query: str) -> Tuple[Optional[int], float]:
+        terms = _terms(query)
+        if not terms or not self.entries:
+            return None, 0.0
+
+        scores: Dict[int, float] = {}
+        covered: Dict[int, float] = {}
+        for term in set(terms):
+            for i, freq in self.postings.get(term, []):
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lens[i] / self.avg_len)
+                scores[i] = scores.get(i, 0.0) + self.idf[term] * freq * (self.k1 + 1) / (freq + norm)
+                covered[i] = covered.get(i, 0.0) + self.idf[term]
+        if not scores:
+            return None, 0.0
+
+        ranked = sorted(scores.items(), key=lambda s: s[1], reverse=True)
+        best, top = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+
+        # Unknown words weigh as much as the rarest indexed term, so off-topic questions stay low.
+        coverage = covered[best] / sum(self.idf.get(t, self.max_idf) for t in set(terms))
+        margin = 1 - runner_up / top
+        return best, coverage * (0.5 + 0.5 * margin)
+
+    def _vector_match(self, query: str) -> Tuple[Optional[int], float]:
+        query_vector = self.embed(query)
+        best, best_sim = None, 0.0
+        for i, entry in enumerate(self.entries):
+            for vector in entry.get("vectors", []):
+                dot = sum(x * y for x, y in zip(query_vector, vector))
+                norm = math.sqrt(sum(x * x for x in query_vector)) * math.sqrt(sum(y * y for y in vector))
+                sim = dot / norm if norm else 0.0
+                if sim > best_sim:
+                    best, best_sim = i, sim
+        return best, best_sim
+
+    def lookup(self, query: str) -> Optional[Dict]:
+        """
+        Returns {"id", "answer", "confidence", "method"} for a confident match, else None.
+        """
+        start = time.perf_counter()
+        best, confidence = self._keyword_match(query)
+        method = "keyword"
+        hit = best is not None and confidence >= self.min_confidence
+
+        if not hit and confidence >= self.vector_floor and self.uses_vectors:
+            try:
+                best, similarity = self._vector_match(query)
+                hit = best is not None and similarity >= self.min_similarity
+                if hit:
+                    method, confidence = "vector", similarity
+            except Exception as ex:
+                print("FAQ vector match failed:", ex)
+
+        with self._stats_lock:
+            self.stats["lookups"] += 1
+            self.stats["confidence_histogram"][min(int(confidence * 10), 9)] += 1
+            self.stats["lookup_us_total"] += (time.perf_counter() - start) * 1e6
+            if hit:
+                self.stats["hits"] += 1
+                self.stats["hits_by_method"][method] += 1
+        if not hit:
+            return None
+
+        entry = self.entries[best]
+        return {"id": entry["id"], "answer": entry["answer"], "confidence": confidence, "method": method}
+
+    def export_stats(self) -> Dict:
+        """
+        Hit ratio and best-candidate confidence distribution (10 buckets of 0.1) since startup.
+        """
+        with self._stats_lock:
+            lookups = self.stats["lookups"]
+            return {
+                "version": self.artifact["version"],
+                "built_at": self.artifact.get("built_at"),
+                "source_sha256": self.artifact.get("source_sha256"),
+                "entries": len(self.entries),
+                "lookups": lookups,
+                "hits": self.stats["hits"],
+                "hit_ratio": self.stats["hits"] / lookups if lookups else 0.0,
+                "hits_by_method": dict(self.stats["hits_by_method"]),
+                "confidence_histogram": {
+                    f"{n / 10:.1f}-{(n + 1) / 10:.1f}": count
+                    for n, count in enumerate(self.stats["confidence_histogram"])
+                },
+                "avg_lookup_us": self.stats["lookup_us_total"] / lookups if lookups else 0.0,
+            }
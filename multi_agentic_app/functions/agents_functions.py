@@ -3,13 +3,52 @@ import json
 from typing import List, Dict, Optional
 
 from dotenv import load_dotenv
-from openai import AzureOpenAI
+
+from .clients import openai_client
+from .model_cascade import cascade_completion
+
+
+NO_INFO_FOUND = "NO_INFO_FOUND"
+
+RAG_SYSTEM_PROMPT = (
+    "You are a knowledge base search assistant. "
+    "Your role is to find and return accurate information from the documents. "
+    "Rules: "
+    "1. Only respond with information found in the documents. "
+    f"2. If no relevant information is found, respond exactly: '{NO_INFO_FOUND}'. "
+    "3. Do not make up or assume any data. "
+    "4. Be concise and direct."
+)
+
+
+def rag_data_sources() -> Dict:
+    """
+    extra_body for chat completions grounded on the Azure AI Search index (vector query).
+    """
+    return {
+        "data_sources": [
+            {
+                "type": "azure_search",
+                "parameters": {
+                    "endpoint": os.getenv("SEARCH_ENDPOINT"),
+                    "index_name": os.getenv("INDEX_NAME"),
+                    "authentication": {"type": "api_key", "key": os.getenv("SEARCH_KEY")},
+                    "query_type": "vector",
+                    "embedding_dependency": {
+                        "type": "deployment_name",
+                        "deployment_name": os.getenv("EMBEDDING_MODEL"),
+                    },
+                },
+            }
+        ]
+    }
 
 
 def rag_search(query: str, history_json: Optional[str] = None) -> str:
     """
     Tool: rag_search
     - Uses AzureOpenAI and Azure AI Search vector RAG
+    - Runs on the "rag" stage deployment and escalates to CHAT_MODEL on NO_INFO_FOUND
     - Returns a grounded answer as plain text.
     """
     try:
@@ -53,52 +92,17 @@ def rag_search(query: str, history_json: Optional[str] = None) -> str:
                 pass
 
         if not any(m.get("role") == "system" for m in history):
-            history.insert(
-                0,
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a knowledge base search assistant. "
-                        "Your role is to find and return accurate information from the documents. "
-                        "Rules: "
-                        "1. Only respond with information found in the documents. "
-                        "2. If no relevant information is found, respond exactly: 'NO_INFO_FOUND'. "
-                        "3. Do not make up or assume any data. "
-                        "4. Be concise and direct."
-                    ),
-                },
-            )
+            history.insert(0, {"role": "system", "content": RAG_SYSTEM_PROMPT})
 
         messages = history + [{"role": "user", "content": query}]
 
-        rag_params = {
-            "data_sources": [
-                {
-                    "type": "azure_search",
-                    "parameters": {
-                        "endpoint": search_url,
-                        "index_name": index_name,
-                        "authentication": {"type": "api_key", "key": search_key},
-                        "query_type": "vector",
-                        "embedding_dependency": {
-                            "type": "deployment_name",
-                            "deployment_name": embedding_model,
-                        },
-                    },
-                }
-            ]
-        }
-
-        client = AzureOpenAI(
-            api_version="2024-12-01-preview",
-            azure_endpoint=open_ai_endpoint,
-            api_key=open_ai_key,
-        )
-
-        response = client.chat.completions.create(
-            model=chat_model,
+        response = cascade_completion(
+            openai_client(),
+            "rag",
+            check=lambda r: "no_info_found" if NO_INFO_FOUND in (r.choices[0].message.content or "") else None,
+            use_logprobs=False,
             messages=messages,
-            extra_body=rag_params,
+            extra_body=rag_data_sources(),
         )
 
         return response.choices[0].message.content or ""
@@ -0,0 +1,52 @@
+import os
+from typing import Any, Dict
+
+import httpx
+from openai import AzureOpenAI
+
+
+OPEN_AI_API_VERSION = "2024-12-01-preview"
+GRAPH_URL = "https://graph.facebook.com/v22.0"
+
+POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=300)
+TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+_clients: Dict[str, Any] = {}
+
+
+def openai_client() -> AzureOpenAI:
+    """
+    Shared AzureOpenAI client backed by one keep-alive connection pool.
+    - Built on first use; the app lifespan builds it at startup so requests reuse warm connections.
+    """
+    if "openai" not in _clients:
+        _clients["openai"] = AzureOpenAI(
+            azure_endpoint=os.getenv("OPEN_AI_ENDPOINT"),
+            api_key=os.getenv("OPEN_AI_KEY"),
+            api_version=OPEN_AI_API_VERSION,
+            http_client=httpx.Client(limits=POOL_LIMITS, timeout=TIMEOUT),
+        )
+    return _clients["openai"]
+
+
+def graph_client() -> httpx.AsyncClient:
+    """
+    Pooled client for the WhatsApp Cloud (Graph) API, authenticated with WHATSAPP_TOKEN.
+    """
+    if "graph" not in _clients:
+        _clients["graph"] = httpx.AsyncClient(
+            base_url=GRAPH_URL,
+            headers={"Authorization": f"Bearer {os.getenv('WHATSAPP_TOKEN')}"},
+            limits=POOL_LIMITS,
+            timeout=TIMEOUT,
+        )
+    return _clients["graph"]
+
+
+async def close_clients() -> None:
+    for name, client in list(_clients.items()):
+        if isinstance(client, httpx.AsyncClient):
+            await client.aclose()
+        else:
+            client.close()
+        del _clients[name]
@@ -0,0 +1,182 @@
+import json
+import math
+import os
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+
+
+STAGES = ("router", "rag", "answer")
+
+
+# -----------------------
+# Configuration
+# -----------------------
+def large_model() -> Optional[str]:
+    return os.getenv("CHAT_MODEL")
+
+
+def stage_model(stage: str) -> Optional[str]:
+    """
+    Deployment for the first attempt of a stage:
+    ROUTER_MODEL / RAG_MODEL / ANSWER_MODEL, else SMALL_CHAT_MODEL, else CHAT_MODEL.
+    """
+    return os.getenv(f"{stage.upper()}_MODEL") or os.getenv("SMALL_CHAT_MODEL") or large_model()
+
+
+def tier_of(model: Optional[str]) -> str:
+    return "large" if model == large_model() else "small"
+
+
+# -----------------------
+# Stats
+# -----------------------
+class CascadeStats:
+    """
+    Per-tier calls, latency and token usage plus per-stage escalation counts since startup.
+    """
+
+    def __init__(self):
+        self.tiers: Dict[str, Dict[str, float]] = {}
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    def record_call(self, model: Optional[str], latency_ms: float, response: Any) -> None:
+        tier = self.tiers.setdefault(
+            tier_of(model),
+            {"calls": 0, "latency_ms_total": 0.0, "prompt_tokens": 0, "completion_tokens": 0},
+        )
+        tier["calls"] += 1
+        tier["latency_ms_total"] += latency_ms
+        usage = getattr(response, "usage", None)
+        if usage:
+            tier["prompt_tokens"] += usage.prompt_tokens or 0
+            tier["completion_tokens"] += usage.completion_tokens or 0
+
+    def record_request(self, stage: str, reason: Optional[str]) -> None:
+        entry = self.stages.setdefault(stage, {"requests": 0, "escalations": 0, "reasons": Counter()})
+        entry["requests"] += 1
+        if reason:
+            entry["escalations"] += 1
+            entry["reasons"][reason] += 1
+
+    def export(self) -> Dict:
+        tiers = {}
+        for name, t in self.tiers.items():
+            tokens = t["prompt_tokens"] + t["completion_tokens"]
+            cost_per_1k = float(os.getenv(f"{name.upper()}_MODEL_COST_PER_1K", "0"))
+            tiers[name] = {
+                "calls": t["calls"],
+                "avg_latency_ms": t["latency_ms_total"] / t["calls"] if t["calls"] else 0.0,
+                "prompt_tokens": t["prompt_tokens"],
+                "completion_tokens": t["completion_tokens"],
+                "est_cost": tokens / 1000 * cost_per_1k,
+            }
+        stages = {
+            name: {
+                "requests": s["requests"],
+                "escalations": s["escalations"],
+                "escalation_rate": s["escalations"] / s["requests"] if s["requests"] else 0.0,
+                "reasons": dict(s["reasons"]),
+            }
+            for name, s in self.stages.items()
+        }
+        return {
+            "models": {stage: stage_model(stage) for stage in STAGES} | {"large": large_model()},
+            "tiers": tiers,
+            "stages": stages,
+        }
+
+
+cascade_stats = CascadeStats()
+
+
+# -----------------------
+# Escalation signals
+# -----------------------
+def tool_call_error(response: Any, known_tools) -> Optional[str]:
+    """
+    Escalation reason for a router response whose tool calls cannot be executed.
+    """
+    for call in getattr(response.choices[0].message, "tool_calls", None) or []:
+        if call.function.name not in known_tools:
+            return "unknown_tool"
+        try:
+            json.loads(call.function.arguments or "{}")
+        except ValueError:
+            return "tool_call_parse_error"
+    return None
+
+
+def _confidence(response: Any) -> Optional[float]:
+    """
+    Geometric-mean token probability of the reply, when logprobs were returned.
+    """
+    logprobs = getattr(response.choices[0], "logprobs", None)
+    content = getattr(logprobs, "content", None) if logprobs else None
+    if not content:
+        return None
+    return math.exp(sum(t.logprob for t in content) / len(content))
+
+
+def _default_reason(response: Any, min_confidence: float) -> Optional[str]:
+    message = response.choices[0].message
+    if not (message.content or "").strip() and not getattr(message, "tool_calls", None):
+        return "empty_reply"
+    confidence = _confidence(response) if min_confidence > 0 else None
+    if confidence is not None and confidence < min_confidence:
+        return "low_confidence"
+    return None
+
+
+# -----------------------
+# Cascade
+# -----------------------
+def timed_completion(client, model: Optional[str], **kwargs) -> Any:
+    """
+    client.chat.completions.create with latency and token usage recorded for the model's tier.
+    - A call that raises is still recorded (elapsed time, no tokens) before the error propagates,
+      so failed attempts that trigger an escalation show up in the tier's latency.
+    """
+    start = time.perf_counter()
+    response = None
+    try:
+        response = client.chat.completions.create(model=model, **kwargs)
+        return response
+    finally:
+        cascade_stats.record_call(model, (time.perf_counter() - start) * 1000, response)
+
+
+def cascade_completion(
+    client,
+    stage: str,
+    check: Optional[Callable[[Any], Optional[str]]] = None,
+    use_logprobs: bool = True,
+    **kwargs,
+) -> Any:
+    """
+    Chat completion that tries the stage's deployment first and retries once on CHAT_MODEL.
+    - check(response) returns an escalation reason (e.g. "no_info_found") or None.
+    - Errors and empty replies always escalate; with CASCADE_MIN_CONFIDENCE > 0 the first attempt also
+      requests logprobs and escalates when the reply's mean token probability is below it
+      (use_logprobs=False for calls that do not support logprobs, e.g. azure_search data sources).
+    """
+    model = stage_model(stage)
+    large = large_model()
+    if model == large:
+        response = timed_completion(client, model, **kwargs)
+        cascade_stats.record_request(stage, None)
+        return response
+
+    min_confidence = float(os.getenv("CASCADE_MIN_CONFIDENCE", "0")) if use_logprobs else 0.0
+    first_kwargs = {**kwargs, "logprobs": True} if min_confidence > 0 else kwargs
+    try:
+        response = timed_completion(client, model, **first_kwargs)
+        reason = (check(response) if check else None) or _default_reason(response, min_confidence)
+    except Exception as ex:
+        print(f"CASCADE: {stage} call on {model} failed: {ex}")
+        reason = "error"
+    cascade_stats.record_request(stage, reason)
+    if reason:
+        print(f"CASCADE: {stage} escalated to {large} ({reason})")
+        response = timed_completion(client, large, **kwargs)
+    return response
@@ -0,0 +1,38 @@
+import re
+import unicodedata
+from typing import List
+
+
+STOPWORDS = {
+    "a", "an", "and", "are", "can", "do", "does", "for", "from", "how", "i",
+    "if", "in", "is", "it", "me", "my", "of", "on", "or", "the", "to", "what",
+    "when", "where", "which", "who", "will", "with", "you", "your",
+}
+
+
+def normalize_text(text: str) -> str:
+    """
+    Folds unicode dashes/quotes and whitespace so e.g. "3–5" and "3-5" compare equal.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    text = re.sub("[\u2010-\u2015]", "-", text)
+    text = re.sub("[\u2018\u2019]", "'", text)
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased word tokens, e.g. "9:00", "24/7" and "3-5" stay whole.
+    """
+    return re.findall(r"[a-z0-9]+(?:[:/'.-][a-z0-9]+)*", normalize_text(text))
+
+
+def content_tokens(text: str) -> List[str]:
+    return [t for t in tokenize(text) if t not in STOPWORDS]
+
+
+def stem(token: str) -> str:
+    """
+    Crude plural folding ("hours" -> "hour") so query and document wording line up.
+    """
+    return token[:-1] if len(token) > 3 and token.endswith("s") else token
@@ -0,0 +1,166 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+from .functions.agents_functions import RAG_SYSTEM_PROMPT, rag_data_sources
+from .functions.clients import graph_client, openai_client
+from .functions.model_cascade import STAGES, large_model, stage_model
+
+
+# Set at import time, i.e. as close to process start as the app can measure.
+PROCESS_START = time.perf_counter()
+
+REQUIRED_ENV = ("OPEN_AI_ENDPOINT", "OPEN_AI_KEY", "CHAT_MODEL")
+
+# Dependencies whose warmup must succeed before the instance reports ready (CHAT_MODEL);
+# the other checks are reported in /readyz but do not hold readiness.
+CRITICAL_CHECKS = ("openai",)
+
+startup_state: Dict[str, Any] = {
+    "warmup_done": False,
+    "ready": False,
+    "clients_ms": None,
+    "warmup_ms": None,
+    "time_to_ready_ms": None,
+    "retries": 0,
+    "checks": {},
+}
+
+
+def _ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def validate_env() -> None:
+    missing = [name for name in REQUIRED_ENV if not os.getenv(name)]
+    if missing:
+        raise RuntimeError(f"Missing {' / '.join(missing)}")
+
+
+# -----------------------
+# Warmup checks
+# -----------------------
+def _warm_openai() -> str:
+    """
+    One-token completion on CHAT_MODEL: opens the pooled TLS connection and pays the
+    large deployment's first-request cost before a customer does.
+    """
+    openai_client().chat.completions.create(
+        model=large_model(),
+        messages=[{"role": "user", "content": "ping"}],
+        max_tokens=1,
+    )
+    return large_model()
+
+
+def _warm_small_models() -> Optional[str]:
+    """
+    Same for the small-tier stage deployments. Not critical: if one is down the cascade
+    escalates its calls to CHAT_MODEL, so the instance can still serve.
+    """
+    deployments = sorted({stage_model(stage) for stage in STAGES} - {large_model()})
+    if not deployments:
+        return None
+    client = openai_client()
+    failed = []
+    for deployment in deployments:
+        try:
+            client.chat.completions.create(
+                model=deployment,
+                messages=[{"role": "user", "content": "ping"}],
+                max_tokens=1,
+            )
+        except Exception as ex:
+            failed.append(f"{deployment}: {ex}")
+    if failed:
+        raise RuntimeError("; ".join(failed))
+    return f"{len(deployments)} deployment(s)"
+
+
+def _warm_rag() -> Optional[str]:
+    """
+    One rag_search-shaped call on the "rag" deployment, so the first customer does not pay
+    the cold path Azure OpenAI -> azure_search data source -> embedding deployment -> Search.
+    """
+    required = ("SEARCH_ENDPOINT", "SEARCH_KEY", "INDEX_NAME", "EMBEDDING_MODEL")
+    if not all(os.getenv(name) for name in required):
+        return None
+    openai_client().chat.completions.create(
+        model=stage_model("rag"),
+        messages=[
+            {"role": "system", "content": RAG_SYSTEM_PROMPT},
+            {"role": "user", "content": "store hours"},
+        ],
+        max_tokens=1,
+        extra_body=rag_data_sources(),
+    )
+    return f"index {os.getenv('INDEX_NAME')}"
+
+
+def _warm_embeddings() -> Optional[str]:
+    """
+    Only needed when the FAQ vector match embeds queries from this process.
+    """
+    embedding_model = os.getenv("EMBEDDING_MODEL")
+    if os.getenv("FAQ_VECTOR_MATCH") != "1" or not embedding_model:
+        return None
+    openai_client().embeddings.create(model=embedding_model, input=["warmup"])
+    return embedding_model
+
+
+async def _warm_graph() -> Optional[str]:
+    phone_number_id = os.getenv("PHONE_NUMBER_ID")
+    if not phone_number_id or not os.getenv("WHATSAPP_TOKEN"):
+        return None
+    resp = await graph_client().get(f"/{phone_number_id}", params={"fields": "id"})
+    resp.raise_for_status()
+    return f"phone number {phone_number_id}"
+
+
+async def _run_check(name: str, check) -> None:
+    start = time.perf_counter()
+    try:
+        if asyncio.iscoroutinefunction(check):
+            detail = await check()
+        else:
+            detail = await asyncio.to_thread(check)
+        result = {"ok": True, "skipped": detail is None, "detail": detail}
+    except Exception as ex:
+        result = {"ok": False, "error": str(ex)}
+    result["ms"] = _ms(start)
+    startup_state["checks"][name] = result
+
+
+async def warm_up(max_backoff_s: float = 30.0) -> None:
+    """
+    Runs the dependency warmups concurrently, then retries failed critical checks
+    with exponential backoff until they pass, so a transient outage during
+    startup does not leave the instance unready for the life of the process.
+    """
+    warmups = {
+        "openai": _warm_openai,
+        "small_models": _warm_small_models,
+        "rag": _warm_rag,
+        "embeddings": _warm_embeddings,
+        "graph": _warm_graph,
+    }
+    start = time.perf_counter()
+    await asyncio.gather(*(_run_check(name, check) for name, check in warmups.items()))
+    startup_state["warmup_ms"] = _ms(start)
+    startup_state["warmup_done"] = True
+
+    delay = 1.0
+    while True:
+        failed = [name for name in CRITICAL_CHECKS if not startup_state["checks"][name]["ok"]]
+        if not failed:
+            break
+        print(f"STARTUP: {', '.join(failed)} warmup failed, retrying in {delay:.0f}s")
+        await asyncio.sleep(delay)
+        startup_state["retries"] += 1
+        await asyncio.gather(*(_run_check(name, warmups[name]) for name in failed))
+        delay = min(delay * 2, max_backoff_s)
+
+    startup_state["ready"] = True
+    startup_state["time_to_ready_ms"] = _ms(PROCESS_START)
+    print("STARTUP:", startup_state)